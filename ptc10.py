@@ -3,15 +3,47 @@ PTC10 Controller Interface
 """
 from typing import List, Dict, Union
 from errno import EISCONN
+import functools
+import logging
+import logging.handlers
+import queue
 import socket
+import time
+
+import numpy as np
 
 from hardware_device_base import HardwareSensorBase
 
+
+@functools.lru_cache(maxsize=128)
+def _encode_cmd(command: str) -> bytes:
+    """Encode a command with its terminating newline, caching the result."""
+    return (command + "\n").encode()
+
+
+def _build_value_packer(names: List[str]):
+    """
+    Generate a function mapping a value list to a dict keyed by ``names``.
+
+    The channel list is fixed for the life of a connection, so a
+    straight-line dict literal specialized to the known names and
+    positions replaces the generic zip/dict construction per call.
+    """
+    entries = ", ".join(f"{name!r}: vals[{i}]" for i, name in enumerate(names))
+    src = f"def pack(vals):\n    return {{{entries}}}"
+    namespace = {}
+    exec(src, namespace)  # pylint: disable=exec-used
+    return namespace["pack"]
+
+
 class PTC10(HardwareSensorBase):
     """
     Interface for controlling the PTC10 controller.
     """
     channel_names = None
+    _channel_names_ordered = None
+    _pack_values = None
+    supports_pipelining = True
 
     def __init__(self, log: bool = True, logfile: str = __name__.rsplit(".", 1)[-1] ):
         """
@@ -23,14 +55,37 @@ class PTC10(HardwareSensorBase):
         """
         super().__init__(log, logfile)
         self.sock: socket.socket | None = None
+        self._rfile = None
+        self._wfile = None
+        self._drain_buf = bytearray(65536)
+        self._read_timeout = None
+        self._values_cache = (None, 0.0)
+        self._log_listener = None
+        if log:
+            self._decouple_logging()
         self.id_str: str = ""
 
-    def connect(self, host, port, con_type="tcp") -> None: # pylint: disable=W0221
-        """ Connect to controller. """
+    def connect(self, host, port, con_type="tcp", timeout=5.0) -> None: # pylint: disable=W0221
+        """ Connect to controller.
+
+        Args:
+            host (str): Controller hostname or IP address.
+            port (int): Controller port.
+            con_type (str): Connection type ("tcp").
+            timeout (float): Socket timeout in seconds for connect and reads.
+        """
         if self.validate_connection_params((host, port)):
             if con_type == "tcp":
+                self._read_timeout = timeout
                 if self.sock is None:
                     self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                    # Small query/reply messages: disable Nagle so writes are
+                    # not delayed waiting for the previous reply's ACK.
+                    self.sock.setsockopt(socket.IPPROTO_TCP,
+                                         socket.TCP_NODELAY, 1)
+                    self.sock.setsockopt(socket.SOL_SOCKET,
+                                         socket.SO_RCVBUF, 65536)
+                self.sock.settimeout(timeout)
                 try:
                     self.sock.connect((host, port))
                     self.report_info(f"Connected to {host}:{port}")
@@ -43,9 +98,28 @@ class PTC10(HardwareSensorBase):
                     else:
                         self.report_error(f"Connection error {e.strerror}")
                         self._set_connected(False)
-                # clear socket
+                # clear socket and set up buffered reader/writer
                 if self.is_connected():
                     self._clear_socket()
+                    self._rfile = self.sock.makefile("rb", buffering=65536)
+                    self._wfile = self.sock.makefile("wb", buffering=0)
+                    # Warm the name cache for the life of this socket so
+                    # the first value read doesn't pay the lookup, and
+                    # concurrent callers can't race duplicate queries.
+                    # connect() reports failures rather than raising, so
+                    # a peer that accepts TCP but won't answer queries
+                    # tears the connection down instead of leaking.
+                    try:
+                        self._load_channel_names()
+                    except OSError as e:
+                        self.report_error(f"Failed to read channel names: {e}")
+                        self._rfile.close()
+                        self._rfile = None
+                        self._wfile.close()
+                        self._wfile = None
+                        self.sock.close()
+                        self.sock = None
+                        self._set_connected(False)
             elif con_type == "serial":
                 self.report_error("Serial connection not yet implemented")
                 self._set_connected(False)
@@ -56,16 +130,53 @@ class PTC10(HardwareSensorBase):
             self.report_error(f"Invalid connection arguments: {host}:{port}")
             self._set_connected(False)
 
+    def _decouple_logging(self) -> None:
+        """
+        Move the logger's handlers behind a QueueHandler/QueueListener
+        pair, so hot-path log calls only enqueue records and a background
+        thread performs the blocking file I/O.
+        """
+        handlers = [h for h in self.logger.handlers
+                    if not isinstance(h, logging.handlers.QueueHandler)]
+        if not handlers:
+            return
+        log_queue = queue.Queue(-1)
+        for handler in handlers:
+            self.logger.removeHandler(handler)
+        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        self._log_listener = logging.handlers.QueueListener(log_queue, *handlers)
+        self._log_listener.start()
+
+    def _restore_logging(self) -> None:
+        """Stop the queue listener and re-attach its handlers directly."""
+        if self._log_listener is None:
+            return
+        self._log_listener.stop()
+        for handler in self.logger.handlers[:]:
+            if isinstance(handler, logging.handlers.QueueHandler):
+                self.logger.removeHandler(handler)
+        for handler in self._log_listener.handlers:
+            self.logger.addHandler(handler)
+        self._log_listener = None
+
     def _clear_socket(self):
         """ Clear socket buffer. """
         if self.sock is not None:
+            # recv_into a preallocated buffer: one call drains the kernel
+            # buffer without allocating bytes for data we throw away.
             self.sock.setblocking(False)
-            while True:
-                try:
-                    _ = self.sock.recv(1024)
-                except BlockingIOError:
-                    break
-            self.sock.setblocking(True)
+            try:
+                while self.sock.recv_into(self._drain_buf):
+                    pass
+            except BlockingIOError:
+                pass
+            finally:
+                # Restore the read timeout (setblocking would clear it).
+                self.sock.settimeout(self._read_timeout)
+
+    def _debug_on(self) -> bool:
+        """True when debug-level logging is enabled."""
+        return self.logger.isEnabledFor(logging.DEBUG)
 
     def _send_command(self, command: str) -> bool: # pylint: disable=W0221
         """
@@ -78,18 +189,20 @@ class PTC10(HardwareSensorBase):
             self.report_error("Device not connected")
             return False
         try:
-            self.report_debug(f"Sending: {command}")
+            if self._debug_on():
+                self.report_debug(f"Sending: {command}")
             with self.lock:
-                self.sock.sendall((command + "\n").encode())
+                self._wfile.write(_encode_cmd(command))
         except Exception as ex:
             self.report_error(f"Failed to send command: {ex}")
             raise IOError(f"Failed to send command: {ex}") from ex
-        self.report_debug("Command sent")
+        if self._debug_on():
+            self.report_debug("Command sent")
         return True
 
     def _read_reply(self) -> Union[str, None]:
         """
-        Read a response from the controller.
+        Read a newline-terminated response from the controller.
 
         Returns:
             str: The received message, stripped of trailing newline.
@@ -98,11 +211,35 @@ class PTC10(HardwareSensorBase):
             self.report_error("Device not connected")
             return None
         try:
-            retval = self.sock.recv(4096).decode().strip()
+            raw = self._rfile.readline()
+        except Exception as ex:
+            raise IOError(f"Failed to _read_reply message: {ex}") from ex
+        if not raw:
+            # readline() returns b"" on EOF rather than raising.
+            raise IOError("Connection closed by peer")
+        retval = raw.decode().strip()
+        if self._debug_on():
             self.report_debug(f"Received: {retval}")
-            return retval
+        return retval
+
+    def _read_reply_raw(self) -> Union[bytes, None]:
+        """
+        Read a newline-terminated response without decoding.
+
+        Returns:
+            bytes: The received line, including line terminators.
+        """
+        if not self.is_connected():
+            self.report_error("Device not connected")
+            return None
+        try:
+            raw = self._rfile.readline()
         except Exception as ex:
             raise IOError(f"Failed to _read_reply message: {ex}") from ex
+        if not raw:
+            # readline() returns b"" on EOF rather than raising.
+            raise IOError("Connection closed by peer")
+        return raw
 
     def query(self, msg: str) -> str:
         """
@@ -117,6 +254,47 @@ class PTC10(HardwareSensorBase):
         self._send_command(msg)
         return self._read_reply()
 
+    def query_raw(self, msg: str) -> bytes:
+        """
+        Send a command and read the undecoded response.
+
+        Args:
+            msg (str): Command string to send.
+
+        Returns:
+            bytes: Raw response line from the controller.
+        """
+        self._send_command(msg)
+        return self._read_reply_raw()
+
+    def pipelined_query(self, msgs: List[str]) -> List[str]:
+        """
+        Send several commands back-to-back, then read all the replies.
+
+        The commands go out in a single write so the total latency is
+        roughly one round trip instead of one per command. Set
+        ``supports_pipelining`` False to fall back to sequential queries
+        on firmware that rejects back-to-back commands.
+
+        Args:
+            msgs (List[str]): Command strings to send.
+
+        Returns:
+            List[str]: One response per command, in order.
+        """
+        if not self.supports_pipelining:
+            return [self.query(msg) for msg in msgs]
+        if not self.is_connected():
+            self.report_error("Device not connected")
+            return []
+        try:
+            with self.lock:
+                self._wfile.write(b"".join(_encode_cmd(msg) for msg in msgs))
+        except Exception as ex:
+            self.report_error(f"Failed to send commands: {ex}")
+            raise IOError(f"Failed to send commands: {ex}") from ex
+        return [self._read_reply() for _ in msgs]
+
     def disconnect(self):
         """
         Close the connection to the controller.
@@ -126,11 +304,18 @@ class PTC10(HardwareSensorBase):
             return
         try:
             self.report_info('Closing connection to controller')
+            if self._rfile:
+                self._rfile.close()
+                self._rfile = None
+            if self._wfile:
+                self._wfile.close()
+                self._wfile = None
             if self.sock:
                 self.sock.close()
                 self.sock = None
             self._set_connected(False)
             self.report_info("Disconnected from device")
+            self._restore_logging()
         except Exception as ex:
             raise IOError(f"Failed to close connection: {ex}") from ex
 
@@ -145,10 +330,18 @@ class PTC10(HardwareSensorBase):
         self.report_info(f"Device identification: {id_str}")
         return id_str
 
+    def _load_channel_names(self) -> List[str]:
+        """Fetch channel names, caching an ordered list and a lookup set."""
+        names = self.get_channel_names()
+        self._channel_names_ordered = names
+        self.channel_names = frozenset(names)
+        self._pack_values = _build_value_packer(names)
+        return names
+
     def validate_channel_name(self, channel_name: str) -> bool:
         """Is item name valid?"""
         if self.channel_names is None:
-            self.channel_names = self.get_channel_names()
+            self._load_channel_names()
         return channel_name in self.channel_names
 
     def get_atomic_value(self, item: str = "") -> float:
@@ -162,13 +355,15 @@ class PTC10(HardwareSensorBase):
             float: Current value, or NaN if invalid.
         """
         if self.validate_channel_name(item):
-            self.report_debug(f"Channel name validated: {item}")
+            if self._debug_on():
+                self.report_debug(f"Channel name validated: {item}")
             # Spaces not allowed
             query_channel = item.replace(" ", "")
             response = self.query(f"{query_channel}?")
             try:
                 value = float(response)
-                self.report_debug(f"Channel {item} value: {value}")
+                if self._debug_on():
+                    self.report_debug(f"Channel {item} value: {value}")
                 self.report_info("Atomic value retrieved")
                 return value
             except ValueError:
@@ -178,6 +373,41 @@ class PTC10(HardwareSensorBase):
             self.report_error(f"Invalid item name: {item}")
             return float("nan")
 
+    def get_atomic_values(self, items: List[str]) -> List[float]:
+        """
+        Read the latest values of several items in one round trip.
+
+        The per-item queries are pipelined over the existing socket (see
+        pipelined_query), so the cost is roughly one round trip instead
+        of one per item. Invalid names return NaN without a query.
+
+        Args:
+            items (List[str]): Channel names (e.g., ["3A", "Out 1"]).
+
+        Returns:
+            List[float]: Current values, with NaN where invalid.
+        """
+        valid = [item for item in items if self.validate_channel_name(item)]
+        # Spaces not allowed
+        responses = self.pipelined_query(
+            [f"{item.replace(' ', '')}?" for item in valid])
+        replies = dict(zip(valid, responses))
+        values = []
+        for item in items:
+            response = replies.get(item)
+            if response is None:
+                self.report_error(f"Invalid item name: {item}")
+                values.append(float("nan"))
+                continue
+            try:
+                values.append(float(response))
+            except ValueError:
+                self.report_error(f"Invalid float returned for item{item}: {response}")
+                values.append(float("nan"))
+        if self._debug_on():
+            self.report_debug(f"Atomic values: {dict(zip(items, values))}")
+        return values
+
     def get_all_values(self) -> List[float]:
         """
         Read the latest values of all channels.
@@ -186,10 +416,33 @@ class PTC10(HardwareSensorBase):
             List[float]: List of float values, with NaN where applicable.
         """
         response = self.query("getOutput?")
-        values = [
-            float(val) if val != "NaN" else float("nan") for val in response.split(",")
-        ]
-        self.report_debug(f"Output values: {values}")
+        # np.float64 parses "NaN" natively, so no per-element branch needed.
+        values = np.array(response.split(","), dtype=np.float64).tolist()
+        if self._debug_on():
+            self.report_debug(f"Output values: {values}")
+        return values
+
+    def get_all_values_cached(self, ttl: float = 0.5) -> List[float]:
+        """
+        Read the latest values of all channels, reusing a recent reply.
+
+        Repeated calls within ``ttl`` seconds return the cached values
+        instead of issuing another `getOutput?` query.
+
+        Args:
+            ttl (float): Maximum cache age in seconds.
+
+        Returns:
+            List[float]: List of float values, with NaN where applicable.
+        """
+        values, timestamp = self._values_cache
+        now = time.monotonic()
+        if values is not None and now - timestamp < ttl:
+            if self._debug_on():
+                self.report_debug("Returning cached output values")
+            return values
+        values = self.get_all_values()
+        self._values_cache = (values, now)
         return values
 
     def get_channel_names(self) -> List[str]:
@@ -199,8 +452,11 @@ class PTC10(HardwareSensorBase):
         Returns:
             List[str]: List of item names.
         """
-        response = self.query("getOutputNames?")
-        names = [name.strip() for name in response.split(",")]
+        raw = self.query_raw("getOutputNames?")
+        # Drop line terminators in one C pass; interior spaces are part of
+        # names like "Out 1", so only the separator padding is stripped.
+        names = [name.strip().decode()
+                 for name in raw.translate(None, b"\r\n").split(b",")]
         self.report_debug(f"Channel names: {names}")
         return names
 
@@ -208,7 +464,8 @@ class PTC10(HardwareSensorBase):
         """Initialize the controller."""
         self.report_info("Initializing controller")
         self.id_str = self.identify()
-        self.channel_names = self.get_channel_names()
+        if self.channel_names is None:
+            self._load_channel_names()
         if self.is_output_enabled():
             self.report_info("Outputs enabled")
         else:
@@ -222,10 +479,15 @@ class PTC10(HardwareSensorBase):
         Returns:
             Dict[str, float]: Mapping of item names to values.
         """
-        names = self.get_channel_names()
-        values = self.get_all_values()
-        output_dict = dict(zip(names, values))
-        self.report_debug(f"Named outputs: {output_dict}")
+        if self.channel_names is None:
+            self._load_channel_names()
+        values = self.get_all_values_cached()
+        if self._pack_values is not None:
+            output_dict = self._pack_values(values)
+        else:
+            output_dict = dict(zip(self._channel_names_ordered, values))
+        if self._debug_on():
+            self.report_debug(f"Named outputs: {output_dict}")
         return output_dict
 
     def is_output_enabled(self) -> bool:
@@ -0,0 +1,212 @@
+"""
+Log PTC10 channel values to an InfluxDB database.
+
+Reads connection and channel parameters from a JSON config file and
+writes one point per configured channel every ``interval_secs`` seconds.
+All channel values are fetched in a single `getOutput?` query per
+iteration rather than one query per channel, and the InfluxDB write
+overlaps the interval sleep instead of extending it.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from typing import Tuple
+
+from influxdb_client import InfluxDBClient, Point, WritePrecision
+from influxdb_client.client.write_api import WriteOptions
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+import ptc10
+
+
+@dataclass(frozen=True, slots=True)
+class LoggerCfg:
+    """Logging configuration, parsed and type-coerced once at startup."""
+    host: str
+    port: int
+    db_url: str
+    db_token: str
+    db_org: str
+    db_bucket: str
+    channel_tag: str
+    db_batch_size: int
+    db_flush_interval_ms: int
+    interval_secs: float
+    verbose: bool
+    logfile: str
+    channels: Tuple[Tuple[str, str, str], ...]
+
+    @classmethod
+    def from_file(cls, config_file: str) -> "LoggerCfg":
+        """Build a LoggerCfg from a JSON config file."""
+        if orjson is not None:
+            with open(config_file, "rb") as cfg_fp:
+                raw = orjson.loads(cfg_fp.read())
+        else:
+            with open(config_file, encoding="utf-8") as cfg_fp:
+                raw = json.load(cfg_fp)
+        return cls(
+            host=raw["host"],
+            port=int(raw["port"]),
+            db_url=raw["db_url"],
+            db_token=raw["db_token"],
+            db_org=raw["db_org"],
+            db_bucket=raw["db_bucket"],
+            channel_tag=str(raw["db_channel"]),
+            db_batch_size=int(raw.get("db_batch_size", 1000)),
+            db_flush_interval_ms=int(raw.get("db_flush_interval_ms", 10_000)),
+            interval_secs=float(raw["interval_secs"]),
+            verbose=bool(raw.get("verbose", False)),
+            logfile=raw.get("logfile", ""),
+            channels=tuple((chan, meta["field"], meta["units"])
+                           for chan, meta in raw["channels"].items()),
+        )
+
+
+async def main(config_file: str) -> None:
+    """
+    Run the logging loop.
+
+    Args:
+        config_file (str): Path to JSON configuration file.
+    """
+    cfg = LoggerCfg.from_file(config_file)
+
+    logger = logging.getLogger("influxdb_log")
+    logger.setLevel(logging.DEBUG if cfg.verbose else logging.INFO)
+    if cfg.logfile:
+        logger.addHandler(logging.FileHandler(cfg.logfile))
+    elif cfg.verbose:
+        # verbose without a logfile: debug output goes to stderr.
+        logger.addHandler(logging.StreamHandler())
+    else:
+        # A NullHandler keeps every log call valid (and cheap) so the
+        # loop needs no "if logger:" branches.
+        logger.addHandler(logging.NullHandler())
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    # Bind the bound methods once; the loop then calls them without
+    # re-resolving the attribute every iteration.
+    log_info, log_debug = logger.info, logger.debug
+    log_warning = logger.warning
+
+    bucket = cfg.db_bucket
+    org = cfg.db_org
+    interval_secs = cfg.interval_secs
+
+    # Tag values and field names never change, so bind them once into a
+    # per-channel point factory instead of re-formatting every iteration.
+    makers = {
+        chan: (lambda value, ts, field=field, units=units:
+               Point("srs_ptc10").field(field, value)
+               .tag("units", units).tag("channel", cfg.channel_tag)
+               .time(ts, WritePrecision.S))
+        for chan, field, units in cfg.channels
+    }
+
+    ptc = ptc10.PTC10(log=False)
+    ptc.connect(cfg.host, cfg.port)
+    if not ptc.is_connected():
+        logger.critical("Could not connect to PTC10 at %s:%s",
+                        cfg.host, cfg.port)
+        sys.exit(1)
+
+    def on_write_error(conf, data, error):
+        """Log batches the background writer failed to deliver."""
+        log_warning("InfluxDB write failed for %s: %s", conf, error)
+
+    def connect_db():
+        """Create an InfluxDB client and a background-batching write API."""
+        # Line protocol repeats measurement and tag keys per point, so
+        # gzip'd write bodies compress well.
+        client = InfluxDBClient(url=cfg.db_url, token=cfg.db_token,
+                                org=cfg.db_org, enable_gzip=True)
+        # Batching mode: write() only enqueues; a client thread coalesces
+        # points across intervals and flushes when either the batch size
+        # or the flush interval is reached. Write failures surface in
+        # that thread, so they are reported via the error callback.
+        return client, client.write_api(write_options=WriteOptions(
+            batch_size=cfg.db_batch_size,
+            flush_interval=cfg.db_flush_interval_ms,
+            jitter_interval=2_000, retry_interval=5_000),
+            error_callback=on_write_error)
+
+    logger.info("Connecting to InfluxDB at %s", cfg.db_url)
+    db_client, write_api = connect_db()
+
+    backoff = 0.0
+    next_tick = time.monotonic()
+    try:
+        while True:
+            try:
+                # Re-establish the controller connection if a previous
+                # iteration tore it down.
+                if not ptc.is_connected():
+                    ptc.connect(cfg.host, cfg.port)
+                    if not ptc.is_connected():
+                        raise IOError("PTC10 reconnect failed")
+                # One getOutput? round trip covers every configured channel.
+                all_values = await asyncio.to_thread(ptc.get_named_output_dict)
+                # All channels come from the same getOutput? reply, so they
+                # share one second-precision sample time.
+                ts = int(time.time())
+                points = []
+                for chan, make_point in makers.items():
+                    points.append(
+                        make_point(all_values.get(chan, float("nan")), ts))
+                if debug_enabled:
+                    log_debug("Writing %d points", len(points))
+                # Enqueue to the batching write API; flushing happens in
+                # the client's background thread.
+                write_api.write(bucket=bucket, org=org, record=points,
+                                write_precision=WritePrecision.S)
+                backoff = 0.0
+            except OSError as e:
+                # Device I/O error: drop the controller connection so the
+                # next attempt reconnects, and retry after a short,
+                # doubling delay instead of idling for the full poll
+                # interval. Anything else (e.g. a config typo raising
+                # KeyError) propagates so the process exits rather than
+                # silently looping.
+                log_warning("PTC10 I/O error: %s, will retry", e)
+                try:
+                    ptc.disconnect()
+                except IOError:
+                    pass
+                backoff = min(interval_secs, max(0.5, backoff * 2))
+                await asyncio.sleep(backoff)
+                next_tick = time.monotonic()
+                continue
+            # Sleep to a monotonic deadline so the sample cadence stays
+            # interval_secs regardless of how long the iteration took.
+            next_tick += interval_secs
+            sleep_for = next_tick - time.monotonic()
+            if sleep_for > 0:
+                log_info("Waiting %.2f seconds...", sleep_for)
+                await asyncio.sleep(sleep_for)
+            else:
+                log_warning("Interval overran by %.2f seconds", -sleep_for)
+                next_tick = time.monotonic()
+    finally:
+        # Close the write API first so buffered points are flushed.
+        write_api.close()
+        db_client.close()
+        ptc.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Log PTC10 channel values to InfluxDB")
+    parser.add_argument("config_file", help="Path to JSON configuration file")
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args.config_file))
+    except KeyboardInterrupt:
+        pass
@@ -2,8 +2,54 @@
 Unit tests for the PTC10 class in the srs.ptc10 module.
 """
 # pylint: disable=import-error
+import math
+import socket
+import threading
+
+import pytest
+
 from ptc10 import PTC10
 
+# Canned replies for a minimal loopback PTC10.
+REPLIES = {
+    "getOutputNames?": "3A, Out 1",
+    "getOutput?": "12.5, NaN",
+    "*IDN?": "Stanford_Research_Systems,PTC10,s/n123456,ver1.0",
+    "3A?": "12.5",
+    "Out1?": "3.25",
+}
+
+
+def _start_server():
+    """Start a loopback server speaking the PTC10 protocol; returns its port."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+
+    def serve():
+        conn, _ = server.accept()
+        rfile = conn.makefile("rb")
+        while True:
+            line = rfile.readline()
+            if not line:
+                break
+            command = line.decode().strip()
+            conn.sendall((REPLIES.get(command, "NaN") + "\n").encode())
+        conn.close()
+        server.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    return server.getsockname()[1]
+
+
+def _connect():
+    """Connect a controller to a fresh loopback server."""
+    controller = PTC10(log=False)
+    controller.connect("127.0.0.1", _start_server())
+    assert controller.connected
+    return controller
+
+
 def test_not_connected():
     """Test not connected."""
     controller = PTC10()
@@ -14,3 +60,94 @@ def test_connection_fail():
     controller = PTC10()
     controller.connect("127.0.0.1", 50000)
     assert not controller.connected
+
+def test_peer_close_raises_ioerror():
+    """EOF from the controller surfaces as IOError, not a parse error."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+
+    def serve():
+        conn, _ = server.accept()
+        # Answer the connect-time name warm-up, then drop the connection.
+        conn.makefile("rb").readline()
+        conn.sendall(b"3A, Out 1\n")
+        conn.close()
+        server.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    controller = PTC10(log=False)
+    controller.connect("127.0.0.1", server.getsockname()[1])
+    assert controller.connected
+    with pytest.raises(IOError):
+        controller.get_all_values()
+    controller.disconnect()
+
+def test_connect_loads_channel_names():
+    """Channel names are cached at connect, with spaces preserved."""
+    controller = _connect()
+    assert controller.channel_names == frozenset(["3A", "Out 1"])
+    assert controller.validate_channel_name("Out 1")
+    assert not controller.validate_channel_name("bogus")
+    controller.disconnect()
+
+def test_get_channel_names():
+    """Channel names come back in device order."""
+    controller = _connect()
+    assert controller.get_channel_names() == ["3A", "Out 1"]
+    controller.disconnect()
+
+def test_get_all_values():
+    """All values are parsed, with NaN passed through."""
+    controller = _connect()
+    values = controller.get_all_values()
+    assert values[0] == 12.5
+    assert math.isnan(values[1])
+    controller.disconnect()
+
+def test_get_all_values_cached():
+    """Calls within the TTL reuse the cached value list."""
+    controller = _connect()
+    first = controller.get_all_values_cached()
+    assert controller.get_all_values_cached() is first
+    controller.disconnect()
+
+def test_get_named_output_dict():
+    """Values map to names in device order."""
+    controller = _connect()
+    outputs = controller.get_named_output_dict()
+    assert list(outputs) == ["3A", "Out 1"]
+    assert outputs["3A"] == 12.5
+    assert math.isnan(outputs["Out 1"])
+    controller.disconnect()
+
+def test_get_atomic_value():
+    """Single-channel reads strip spaces from the query; bad names are NaN."""
+    controller = _connect()
+    assert controller.get_atomic_value("3A") == 12.5
+    assert controller.get_atomic_value("Out 1") == 3.25
+    assert math.isnan(controller.get_atomic_value("bogus"))
+    controller.disconnect()
+
+def test_get_atomic_values():
+    """Pipelined multi-channel reads keep request order, NaN for bad names."""
+    controller = _connect()
+    values = controller.get_atomic_values(["3A", "bogus", "Out 1"])
+    assert values[0] == 12.5
+    assert math.isnan(values[1])
+    assert values[2] == 3.25
+    controller.disconnect()
+
+def test_get_atomic_values_sequential_fallback():
+    """The sequential fallback returns the same values as pipelining."""
+    controller = _connect()
+    controller.supports_pipelining = False
+    values = controller.get_atomic_values(["3A", "Out 1"])
+    assert values == [12.5, 3.25]
+    controller.disconnect()
+
+def test_pipelined_query():
+    """Back-to-back commands get their replies in order."""
+    controller = _connect()
+    assert controller.pipelined_query(["3A?", "Out1?"]) == ["12.5", "3.25"]
+    controller.disconnect()